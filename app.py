@@ -4,18 +4,24 @@ Uses local Ollama LLMs to tailor your CV and generate cover letters based on job
 """
 
 import streamlit as st
+import asyncio
+import hashlib
 import os
 import sys
 from pathlib import Path
 
+import httpx
+
 # Add project directories to path
 sys.path.append(str(Path(__file__).parent))
 
-from scrapers.job_scraper import JobScraper
+# Only the lightweight LLM-side modules are imported eagerly; the scraper
+# (selenium, bs4, webdriver-manager) and file handler (python-docx, PyPDF2,
+# pdfplumber) are deferred to their cached accessors so reruns and cold start
+# don't pay for import paths the user may never touch.
 from processors.cv_processor import CVProcessor
-from processors.cover_letter_generator import CoverLetterGenerator
+from processors.cover_letter_generator import CoverLetterGenerator, COVER_LETTER_SYSTEM_PROMPT
 from processors.ollama_client import OllamaClient
-from utils.file_handler import FileHandler
 
 # Page configuration
 st.set_page_config(
@@ -25,8 +31,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
+# Custom CSS. Streamlit re-renders every element on each rerun, so the style
+# block must be re-emitted every run (gating it behind session_state would
+# drop the styles after the first interaction) — but the string itself is
+# assembled once per server process instead of per rerun.
+@st.cache_data(show_spinner=False)
+def _page_chrome() -> tuple:
+    """(css, header, sub-header) HTML built once and reused on every rerun"""
+    css = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -56,7 +68,84 @@ st.markdown("""
         color: #856404;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+    header = '<div class="main-header">📄 CV Tailor - AI-Powered Job Application Assistant</div>'
+    sub_header = '<div class="sub-header">Tailor your CV and generate cover letters using local AI models</div>'
+    return css, header, sub_header
+
+
+_css, _header_html, _sub_header_html = _page_chrome()
+st.markdown(_css, unsafe_allow_html=True)
+
+# Cached resources and data — Streamlit reruns the whole script on every
+# widget interaction, so anything expensive must be cached across reruns
+
+@st.cache_resource
+def get_ollama_client() -> OllamaClient:
+    """Single OllamaClient shared across reruns"""
+    return OllamaClient()
+
+
+@st.cache_data(show_spinner=False)
+def extract_structured_cached(model: str, cv_text: str):
+    """One JSON-mode candidate-info extraction per (model, CV) pair"""
+    return CVProcessor(model, 0.1, ollama_client=get_ollama_client()).extract_structured(cv_text)
+
+
+@st.cache_resource
+def get_job_scraper():
+    """Single JobScraper shared across reruns, so its connection pool and
+    pooled headless browsers survive between scrapes"""
+    from scrapers.job_scraper import JobScraper
+    return JobScraper()
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def scrape_job_cached(url: str):
+    """Scrape a job posting, cached by URL so reruns don't re-fetch"""
+    return get_job_scraper().scrape_job(url)
+
+
+@st.cache_resource
+def get_file_handler():
+    """Single FileHandler shared across reruns"""
+    from utils.file_handler import FileHandler
+    return FileHandler()
+
+
+@st.cache_data(show_spinner=False)
+def build_docx(text: str, title: str) -> bytes:
+    """Serialize text to DOCX bytes, cached so reruns don't rebuild the XML"""
+    return get_file_handler().create_docx(text, title)
+
+
+@st.cache_data(show_spinner=False)
+def extract_cv_text(file_bytes: bytes, filename: str):
+    """Extract CV text, cached on the file content so reruns don't re-parse"""
+    import io
+    return get_file_handler().extract_text_from_file(io.BytesIO(file_bytes), filename)
+
+
+def _response_cache_key(kind: str, model: str, temperature: float,
+                        cv_text: str, job_data: dict, company: str = "",
+                        ai_extraction: bool = False) -> tuple:
+    """Cache key for generated materials: identical inputs -> identical key.
+
+    ai_extraction must be set when a cover letter is generated: the AI
+    analysis toggle changes the candidate info fed into the letter prompt,
+    so results produced with and without it are not interchangeable.
+    """
+    job_description = job_data.get('description', '') if job_data else ''
+    return (
+        kind,
+        model,
+        round(temperature, 2),
+        hashlib.sha256(cv_text.encode()).hexdigest(),
+        hashlib.sha256(job_description.encode()).hexdigest(),
+        company,
+        ai_extraction,
+    )
+
 
 # Initialize session state
 if 'job_description' not in st.session_state:
@@ -67,18 +156,24 @@ if 'tailored_cv' not in st.session_state:
     st.session_state.tailored_cv = None
 if 'cover_letter' not in st.session_state:
     st.session_state.cover_letter = None
+if 'short_pitch' not in st.session_state:
+    st.session_state.short_pitch = None
+if 'response_cache' not in st.session_state:
+    # Generated materials keyed on (model, cv hash, job hash, temperature,
+    # company) — clicking Generate again with unchanged inputs skips the LLM
+    st.session_state.response_cache = {}
 
 def main():
     # Header
-    st.markdown('<div class="main-header">📄 CV Tailor - AI-Powered Job Application Assistant</div>', unsafe_allow_html=True)
-    st.markdown('<div class="sub-header">Tailor your CV and generate cover letters using local AI models</div>', unsafe_allow_html=True)
+    st.markdown(_header_html, unsafe_allow_html=True)
+    st.markdown(_sub_header_html, unsafe_allow_html=True)
 
     # Sidebar - Configuration
     with st.sidebar:
         st.header("⚙️ Configuration")
 
         # Check Ollama connection
-        ollama_client = OllamaClient()
+        ollama_client = get_ollama_client()
         if ollama_client.check_connection():
             st.success("✅ Ollama is running")
 
@@ -91,6 +186,13 @@ def main():
                     index=0
                 )
                 st.session_state.selected_model = selected_model
+
+                # Warm the selected model once per session: loads it into
+                # memory and pre-caches the system-prompt KV so the first
+                # generation starts at full speed
+                if st.session_state.get('warmed_model') != selected_model:
+                    ollama_client.warm_up(selected_model, COVER_LETTER_SYSTEM_PROMPT)
+                    st.session_state.warmed_model = selected_model
             else:
                 st.warning("⚠️ No models found. Please pull a model using: ollama pull llama3")
                 st.session_state.selected_model = "llama3"
@@ -106,6 +208,15 @@ def main():
         temperature = st.slider("AI Creativity", 0.0, 1.0, 0.7, 0.1)
         st.session_state.temperature = temperature
 
+        use_ai_extraction = st.checkbox(
+            "AI-powered CV analysis",
+            value=False,
+            help="Profile your CV with a JSON-mode LLM call (cached per CV) "
+                 "instead of the built-in keyword heuristics. Slower on first "
+                 "use, usually more accurate."
+        )
+        st.session_state.use_ai_extraction = use_ai_extraction
+
         st.divider()
         st.markdown("### 📚 How to Use")
         st.markdown("""
@@ -113,6 +224,10 @@ def main():
         2. **Upload your CV** (PDF or DOCX)
         3. Click **Generate** to tailor your CV
         4. **Download** tailored CV and cover letter
+
+        💡 **Tip:** set `OLLAMA_NUM_PARALLEL=3` and
+        `OLLAMA_MAX_LOADED_MODELS=1` before `ollama serve` so the CV,
+        cover letter and pitch generate concurrently in one batch.
         """)
 
     # Main content
@@ -138,8 +253,7 @@ def main():
             if st.button("🔍 Scrape Job Description", type="primary"):
                 if job_url:
                     with st.spinner("Scraping job posting..."):
-                        scraper = JobScraper()
-                        job_data = scraper.scrape_job(job_url)
+                        job_data = scrape_job_cached(job_url)
 
                         if job_data:
                             st.session_state.job_description = job_data
@@ -189,8 +303,7 @@ def main():
 
         if uploaded_file:
             with st.spinner("Processing CV..."):
-                file_handler = FileHandler()
-                cv_text = file_handler.extract_text_from_file(uploaded_file)
+                cv_text = extract_cv_text(uploaded_file.getvalue(), uploaded_file.name)
 
                 if cv_text:
                     st.session_state.original_cv = cv_text
@@ -214,6 +327,12 @@ def main():
     with col5:
         company_name = st.text_input("Company Name (optional)", placeholder="Google")
 
+    force_regenerate = st.checkbox(
+        "Force regenerate",
+        value=False,
+        help="Bypass the cache and call the model again even if nothing changed"
+    )
+
     if st.button("✨ Generate Tailored Application", type="primary", use_container_width=True):
         if not st.session_state.job_description:
             st.error("❌ Please load a job description first")
@@ -221,25 +340,110 @@ def main():
             st.error("❌ Please upload your CV first")
         else:
             # Initialize processors
-            cv_processor = CVProcessor(st.session_state.selected_model, st.session_state.temperature)
-            cover_letter_gen = CoverLetterGenerator(st.session_state.selected_model, st.session_state.temperature)
-
-            # Generate tailored CV
-            if generate_cv:
-                with st.spinner("🔄 Tailoring your CV..."):
-                    st.session_state.tailored_cv = cv_processor.tailor_cv(
-                        st.session_state.original_cv,
-                        st.session_state.job_description
+            cv_processor = CVProcessor(st.session_state.selected_model, st.session_state.temperature,
+                                       ollama_client=get_ollama_client())
+            cover_letter_gen = CoverLetterGenerator(st.session_state.selected_model, st.session_state.temperature,
+                                                    ollama_client=get_ollama_client())
+
+            response_cache = st.session_state.response_cache
+            company = company_name if company_name else st.session_state.job_description.get('company', 'the company')
+
+            # Optional LLM-based candidate profiling (one cached call per CV);
+            # the regex heuristics remain the default / fallback
+            candidate_info = None
+            if generate_cover_letter and st.session_state.get('use_ai_extraction'):
+                with st.spinner("🔎 Analyzing CV..."):
+                    candidate_info = extract_structured_cached(
+                        st.session_state.selected_model,
+                        st.session_state.original_cv
                     )
 
-            # Generate cover letter
-            if generate_cover_letter:
-                with st.spinner("✍️ Writing cover letter..."):
-                    st.session_state.cover_letter = cover_letter_gen.generate_cover_letter(
-                        st.session_state.original_cv,
-                        st.session_state.job_description,
-                        company_name if company_name else st.session_state.job_description.get('company', 'the company')
-                    )
+            cache_key = _response_cache_key(
+                "cv+cl" if (generate_cv and generate_cover_letter) else ("cv" if generate_cv else "cl"),
+                st.session_state.selected_model,
+                st.session_state.temperature,
+                st.session_state.original_cv,
+                st.session_state.job_description,
+                company,
+                ai_extraction=candidate_info is not None,
+            )
+
+            # Exact repeat of a previous generation: serve from cache
+            if not force_regenerate and cache_key in response_cache:
+                cached_cv, cached_cl, cached_pitch = response_cache[cache_key]
+                if generate_cv:
+                    st.session_state.tailored_cv = cached_cv
+                if generate_cover_letter:
+                    st.session_state.cover_letter = cached_cl
+                if cached_pitch:
+                    st.session_state.short_pitch = cached_pitch
+                st.info("♻️ Inputs unchanged — reused previous results (tick 'Force regenerate' to override)")
+
+            # Both requested: batch everything into one Ollama window. The
+            # combined JSON-mode call (CV + cover letter in a single prefill)
+            # runs concurrently with the short-pitch generation; if the
+            # combined call returns malformed JSON, fall back to two separate
+            # concurrent generations.
+            elif generate_cv and generate_cover_letter:
+                async def _generate_all():
+                    async with httpx.AsyncClient(timeout=120) as client:
+                        both, pitch = await asyncio.gather(
+                            asyncio.to_thread(
+                                cv_processor.tailor_both,
+                                st.session_state.original_cv,
+                                st.session_state.job_description,
+                                company
+                            ),
+                            cover_letter_gen.generate_short_pitch_async(
+                                st.session_state.original_cv,
+                                st.session_state.job_description,
+                                client=client
+                            )
+                        )
+                        if not both:
+                            both = await asyncio.gather(
+                                cv_processor.tailor_cv_async(
+                                    st.session_state.original_cv,
+                                    st.session_state.job_description,
+                                    client=client
+                                ),
+                                cover_letter_gen.generate_cover_letter_async(
+                                    st.session_state.original_cv,
+                                    st.session_state.job_description,
+                                    company,
+                                    client=client,
+                                    candidate_info=candidate_info
+                                )
+                            )
+                        return both[0], both[1], pitch
+
+                with st.spinner("🔄 Tailoring CV, writing cover letter and pitch..."):
+                    tailored_cv, cover_letter, pitch = asyncio.run(_generate_all())
+                st.session_state.tailored_cv = tailored_cv
+                st.session_state.cover_letter = cover_letter
+                st.session_state.short_pitch = pitch
+                response_cache[cache_key] = (tailored_cv, cover_letter, pitch)
+
+            # Generate tailored CV (streamed so tokens appear as they arrive)
+            elif generate_cv:
+                st.markdown("**🔄 Tailoring your CV...**")
+                streamed_cv = st.write_stream(cv_processor.tailor_cv_stream(
+                    st.session_state.original_cv,
+                    st.session_state.job_description
+                ))
+                st.session_state.tailored_cv = streamed_cv or st.session_state.original_cv
+                response_cache[cache_key] = (st.session_state.tailored_cv, None, None)
+
+            # Generate cover letter (streamed)
+            elif generate_cover_letter:
+                st.markdown("**✍️ Writing cover letter...**")
+                st.session_state.cover_letter = st.write_stream(cover_letter_gen.generate_cover_letter_stream(
+                    st.session_state.original_cv,
+                    st.session_state.job_description,
+                    company,
+                    candidate_info=candidate_info
+                ))
+                response_cache[cache_key] = (None, st.session_state.cover_letter, None)
 
             st.success("🎉 Application materials generated successfully!")
 
@@ -248,6 +452,9 @@ def main():
         st.divider()
         st.header("📥 Your Tailored Application")
 
+        if st.session_state.short_pitch:
+            st.info(f"💬 **Elevator pitch:** {st.session_state.short_pitch}")
+
         result_col1, result_col2 = st.columns([1, 1])
 
         with result_col1:
@@ -255,8 +462,7 @@ def main():
                 st.subheader("📄 Tailored CV")
                 st.text_area("Tailored Resume", st.session_state.tailored_cv, height=400)
 
-                file_handler = FileHandler()
-                docx_cv = file_handler.create_docx(st.session_state.tailored_cv, "Tailored CV")
+                docx_cv = build_docx(st.session_state.tailored_cv, "Tailored CV")
 
                 st.download_button(
                     label="⬇️ Download Tailored CV (DOCX)",
@@ -271,8 +477,7 @@ def main():
                 st.subheader("✉️ Cover Letter")
                 st.text_area("Cover Letter", st.session_state.cover_letter, height=400)
 
-                file_handler = FileHandler()
-                docx_cl = file_handler.create_docx(st.session_state.cover_letter, "Cover Letter")
+                docx_cl = build_docx(st.session_state.cover_letter, "Cover Letter")
 
                 st.download_button(
                     label="⬇️ Download Cover Letter (DOCX)",
@@ -13,6 +13,7 @@ Features:
 """
 
 from __future__ import annotations
+import functools
 import re
 import time
 import logging
@@ -20,9 +21,60 @@ from typing import Dict, Optional, List
 from dataclasses import dataclass
 
 try:
-    from .ollama_client import OllamaClient
+    from .ollama_client import OllamaClient, build_options, filter_cot_stream
 except ImportError:
-    from ollama_client import OllamaClient
+    from ollama_client import OllamaClient, build_options, filter_cot_stream
+
+
+# Pre-compiled patterns — compiled once at import instead of per call
+_NAME_RE = re.compile(r"[A-Z][a-z]+")
+_TITLE_RE = re.compile(
+    r"\b(engineer|developer|scientist|manager|analyst|designer|architect|consultant|specialist)\b",
+    re.IGNORECASE,
+)
+_TECH_RE = re.compile(
+    r"\b(Python|Java|JavaScript|React|SQL|AWS|Docker|Kubernetes|TensorFlow|PyTorch|C\+\+|Node\.js|Spring|Django|Flask)\b",
+    re.IGNORECASE,
+)
+_ACHV_RE = re.compile(
+    r"(\d+%|increased|reduced|improved|led|delivered|built|achieved|designed)",
+    re.IGNORECASE,
+)
+# All forbidden chain-of-thought markers fused into one alternation so the
+# quality check scans the letter once instead of once per pattern
+_FORBIDDEN_UNION = re.compile(
+    r"<\s*/?\s*think\b|</?reason>|\[thinking\]|\[thought\]"
+    r"|let me think|my reasoning|chain of thought",
+    re.IGNORECASE,
+)
+# Single pattern covering all residual CoT markers, so stripping is one scan
+_STRIP_THINK = re.compile(r"</?(?:think|reason)>|\[think(?:ing)?\]|\[thought\]", re.IGNORECASE)
+
+
+# Built once at import — a constant string also keeps Ollama's prompt-prefix
+# cache keyed consistently across calls
+COVER_LETTER_SYSTEM_PROMPT = """You are a world-class professional cover letter writer and career strategist.
+
+YOUR TASK: Write ONE complete, polished, professional cover letter.
+
+STRICT RULES:
+1. Output ONLY the final cover letter - NO reasoning, NO thinking process, NO chain-of-thought
+2. NEVER use tags like  <think>, </think>, <reason>, [thinking], [thought], or any internal commentary
+3. NEVER invent skills, experience, or qualifications not present in the CV
+4. Use ONLY factual information from the provided CV
+5. Write in a professional yet engaging tone
+6. Focus on alignment between candidate's real experience and job requirements
+7. Be specific and quantitative when possible (cite real achievements)
+8. Keep it concise: 300-450 words, 3-4 paragraphs
+
+FORMAT REQUIREMENTS:
+- Professional business letter format
+- Opening: Strong hook showing enthusiasm for THIS specific role
+- Body: 2-3 key qualifications with specific examples from CV
+- Closing: Confident call-to-action
+- Sign-off: Professional and warm
+
+Begin writing the final cover letter now. No preamble, no explanation - just the letter."""
 
 
 # Logger setup
@@ -37,14 +89,83 @@ if not logger.handlers:
 @dataclass
 class CoverLetterConfig:
     """Configuration for cover letter generation"""
+    # Prefill cost scales ~linearly with prompt size; the full CV is only
+    # included (truncated to fallback_cv_chars) when candidate-info extraction
+    # came up short. Raise max_cv_chars on large-context models to always
+    # ship the full excerpt.
     max_cv_chars: int = 8000
+    fallback_cv_chars: int = 3000
     max_job_chars: int = 4000
     desired_words: tuple = (300, 450)
     paragraphs: int = 4
     retries: int = 3
+    # Quality failures are model-output issues, not transient ones: retry
+    # immediately at lower temperature, and give up after this many since a
+    # third low-temperature attempt rarely differs from the second
+    max_quality_retries: int = 2
     retry_backoff: float = 1.3
 
 
+@functools.lru_cache(maxsize=8)
+def _safe_truncate_cached(text: str, max_chars: int) -> str:
+    """
+    Truncate text at a word boundary, memoized since the same CV / job
+    description is truncated repeatedly across attempts and reruns.
+
+    The space search is bounded to [max_chars // 2, max_chars - 3] — the only
+    range an acceptable cut point can fall in — instead of scanning the whole
+    truncated prefix.
+    """
+    if len(text) <= max_chars:
+        return text
+    hi = max_chars - 3
+    last_space = text.rfind(" ", max_chars // 2, hi)
+    truncated = text[:last_space] if last_space != -1 else text[:hi]
+    return truncated + "..."
+
+
+@functools.lru_cache(maxsize=32)
+def _extract_candidate_info_cached(cv_text: str) -> Dict[str, str]:
+    """
+    Extract structured candidate information from CV text.
+
+    Module-level and memoized: the same CV is scanned once per session even
+    though Streamlit reruns the calling code on every widget interaction.
+    """
+    info = {"name": "", "headline": "", "skills": "", "achievements": ""}
+    lines = [l.strip() for l in cv_text.strip().splitlines() if l.strip()]
+
+    if not lines:
+        return info
+
+    # Extract name (first line with 2-4 capitalized words)
+    first_line = lines[0]
+    if 1 <= len(first_line.split()) <= 4 and _NAME_RE.search(first_line):
+        info["name"] = first_line
+
+    # Single pass over the lines: headline (first 6 lines only), skills
+    # (first 3 hits) and achievements (first 2 hits) are collected together
+    # instead of re-scanning the whole CV once per field
+    skill_lines = []
+    achievements = []
+    for i, line in enumerate(lines):
+        if i < 6 and not info["headline"] and _TITLE_RE.search(line):
+            info["headline"] = line
+        if len(skill_lines) < 3 and _TECH_RE.search(line):
+            skill_lines.append(line)
+        if len(achievements) < 2 and _ACHV_RE.search(line):
+            achievements.append(line)
+        if i >= 6 and len(skill_lines) == 3 and len(achievements) == 2:
+            break
+
+    if skill_lines:
+        info["skills"] = "; ".join(skill_lines)[:400]
+    if achievements:
+        info["achievements"] = "; ".join(achievements)[:500]
+
+    return info
+
+
 class CoverLetterGenerator:
     """
     Advanced cover letter generator with iterative refinement.
@@ -57,10 +178,13 @@ class CoverLetterGenerator:
     Works reliably even with models that natively emit CoT tokens (e.g., Qwen, DeepSeek).
     """
 
-    def __init__(self, model: str = "llama3", temperature: float = 0.7):
+    def __init__(self, model: str = "llama3", temperature: float = 0.7,
+                 ollama_client: OllamaClient = None):
         self.model = model
         self.temperature = temperature
-        self.ollama_client = OllamaClient()
+        # Accept a shared client so the app reuses one connection pool
+        # across the sidebar health check and all processors
+        self.ollama_client = ollama_client or OllamaClient()
         self.config = CoverLetterConfig()
 
     def _extract_candidate_info(self, cv_text: str) -> Dict[str, str]:
@@ -68,47 +192,12 @@ class CoverLetterGenerator:
         Extract structured candidate information using NLP heuristics.
         Returns: dict with name, headline, skills, achievements
         """
-        info = {"name": "", "headline": "", "skills": "", "achievements": ""}
-        lines = [l.strip() for l in cv_text.strip().splitlines() if l.strip()]
-
-        if not lines:
-            return info
-
-        # Extract name (first line with 2-4 capitalized words)
-        first_line = lines[0]
-        if 1 <= len(first_line.split()) <= 4 and re.search(r"[A-Z][a-z]+", first_line):
-            info["name"] = first_line
-
-        # Extract headline/title (look for job titles in first 6 lines)
-        title_keywords = r"\b(engineer|developer|scientist|manager|analyst|designer|architect|consultant|specialist)\b"
-        for line in lines[:6]:
-            if re.search(title_keywords, line, re.I):
-                info["headline"] = line
-                break
-
-        # Extract skills (look for technical keywords)
-        tech_keywords = r"\b(Python|Java|JavaScript|React|SQL|AWS|Docker|Kubernetes|TensorFlow|PyTorch|C\+\+|Node\.js|Spring|Django|Flask)\b"
-        skill_lines = [l for l in lines if re.search(tech_keywords, l, re.I)]
-        if skill_lines:
-            info["skills"] = "; ".join(skill_lines[:3])[:400]
-
-        # Extract quantifiable achievements
-        achievement_pattern = r"(\d+%|increased|reduced|improved|led|delivered|built|achieved|designed)"
-        achievements = [l for l in lines if re.search(achievement_pattern, l, re.I)]
-        if achievements:
-            info["achievements"] = "; ".join(achievements[:2])[:500]
-
-        return info
+        # Copy so callers can't mutate the memoized dict
+        return dict(_extract_candidate_info_cached(cv_text))
 
     def _safe_truncate(self, text: str, max_chars: int) -> str:
         """Truncate text intelligently at word boundaries"""
-        if len(text) <= max_chars:
-            return text
-        truncated = text[:max_chars - 3]
-        last_space = truncated.rfind(" ")
-        if last_space > max_chars // 2:
-            truncated = truncated[:last_space]
-        return truncated + "..."
+        return _safe_truncate_cached(text, max_chars)
 
     def _build_system_prompt(self) -> str:
         """
@@ -117,28 +206,14 @@ class CoverLetterGenerator:
         Explicitly forbids any internal reasoning tokens, even if the model (e.g., Qwen, DeepSeek)
         is configured to emit them by default.
         """
-        return """You are a world-class professional cover letter writer and career strategist.
+        return COVER_LETTER_SYSTEM_PROMPT
 
-YOUR TASK: Write ONE complete, polished, professional cover letter.
-
-STRICT RULES:
-1. Output ONLY the final cover letter - NO reasoning, NO thinking process, NO chain-of-thought
-2. NEVER use tags like  <think>, </think>, <reason>, [thinking], [thought], or any internal commentary
-3. NEVER invent skills, experience, or qualifications not present in the CV
-4. Use ONLY factual information from the provided CV
-5. Write in a professional yet engaging tone
-6. Focus on alignment between candidate's real experience and job requirements
-7. Be specific and quantitative when possible (cite real achievements)
-8. Keep it concise: 300-450 words, 3-4 paragraphs
-
-FORMAT REQUIREMENTS:
-- Professional business letter format
-- Opening: Strong hook showing enthusiasm for THIS specific role
-- Body: 2-3 key qualifications with specific examples from CV
-- Closing: Confident call-to-action
-- Sign-off: Professional and warm
-
-Begin writing the final cover letter now. No preamble, no explanation - just the letter."""
+    def _letter_options(self, system_prompt: str, user_prompt: str) -> Dict:
+        """Generation options bounding the letter to its ~600-token budget"""
+        options = build_options(len(system_prompt) + len(user_prompt), num_predict=700)
+        # A run of blank lines after the sign-off means the model is done
+        options["stop"] = ["\n\n\n\n"]
+        return options
 
     def _build_user_prompt(
         self, 
@@ -149,9 +224,18 @@ Begin writing the final cover letter now. No preamble, no explanation - just the
         candidate_info: Dict[str, str]
     ) -> str:
         """Build detailed user prompt with extracted candidate context"""
-        
+
         job_excerpt = self._safe_truncate(job_description, self.config.max_job_chars)
-        cv_excerpt = self._safe_truncate(cv_text, self.config.max_cv_chars)
+
+        # The extracted candidate info already covers what the letter needs;
+        # shipping the full CV on top of it doubles the prefill tokens for no
+        # gain. Only include a (shorter) CV excerpt when extraction came up
+        # short and the model needs the raw text as backup.
+        if candidate_info.get('skills') and candidate_info.get('achievements'):
+            cv_section = ""
+        else:
+            cv_excerpt = self._safe_truncate(cv_text, self.config.fallback_cv_chars)
+            cv_section = f"\nFULL CV (for context):\n{cv_excerpt}\n"
 
         return f"""GENERATE A PROFESSIONAL COVER LETTER
 
@@ -165,10 +249,7 @@ Name: {candidate_info.get('name', '[Your Name]')}
 Professional Headline: {candidate_info.get('headline', 'Professional')}
 Key Skills: {candidate_info.get('skills', 'See CV below')}
 Notable Achievements: {candidate_info.get('achievements', 'See CV below')}
-
-FULL CV (for context):
-{cv_excerpt}
-
+{cv_section}
 INSTRUCTIONS:
 - Write {self.config.desired_words[0]}-{self.config.desired_words[1]} words
 - Structure: {self.config.paragraphs} paragraphs
@@ -193,24 +274,19 @@ OUTPUT ONLY THE FINAL LETTER. No commentary, no thinking process."""
             return False
 
         # Check for forbidden chain-of-thought markers (common in CoT-enabled models)
-        forbidden_patterns = [
-            r"(<|</)think>", r"(<|</)reason>", 
-            r"\[thinking\]", r"\[thought\]", 
-            r"let me think", r"my reasoning", r"chain of thought",
-            r"<\s*think\b", r"<\s*/\s*think\b"
-        ]
-        for pattern in forbidden_patterns:
-            if re.search(pattern, letter, re.I):
-                logger.warning(f"Detected forbidden chain-of-thought pattern: {pattern}")
-                return False
+        match = _FORBIDDEN_UNION.search(letter)
+        if match:
+            logger.warning(f"Detected forbidden chain-of-thought marker: {match.group()!r}")
+            return False
 
         # Check for placeholder text that wasn't replaced
         if "[Your Name]" in letter and "[Date]" in letter and "Dear Hiring Manager" in letter:
             # This is acceptable - proper format
             pass
-        
-        # Check if it references the job/company
-        if company not in letter and job_title not in letter:
+
+        # Check if it references the job/company (lowercase once, scan once each)
+        letter_lower = letter.lower()
+        if company.lower() not in letter_lower and job_title.lower() not in letter_lower:
             logger.warning("Letter doesn't mention job title or company")
             return False
 
@@ -220,7 +296,8 @@ OUTPUT ONLY THE FINAL LETTER. No commentary, no thinking process."""
         self,
         cv_text: str,
         job_data: Dict,
-        company_name: str = None
+        company_name: str = None,
+        candidate_info: Dict[str, str] = None
     ) -> str:
         """
         Generate a best-in-class, ATS-optimized cover letter.
@@ -229,6 +306,9 @@ OUTPUT ONLY THE FINAL LETTER. No commentary, no thinking process."""
             cv_text: Full CV text
             job_data: Dict with 'title', 'company', 'description'
             company_name: Optional company override
+            candidate_info: Optional pre-extracted candidate info (e.g. from
+                            CVProcessor.extract_structured); regex heuristics
+                            are used when not provided
 
         Returns:
             Professional cover letter text
@@ -241,20 +321,26 @@ OUTPUT ONLY THE FINAL LETTER. No commentary, no thinking process."""
         company = (company_name or job_data.get('company', 'your company')).strip()
         job_description = job_data.get('description', '').strip()
 
-        # Extract structured candidate info
-        logger.info("Extracting candidate information...")
-        candidate_info = self._extract_candidate_info(cv_text)
+        # Extract structured candidate info (unless caller already has it)
+        if not candidate_info:
+            logger.info("Extracting candidate information...")
+            candidate_info = self._extract_candidate_info(cv_text)
 
         # Build prompts
         system_prompt = self._build_system_prompt()
         user_prompt = self._build_user_prompt(
             job_title, company, job_description, cv_text, candidate_info
         )
+        # Retries rebuild from this base so corrective suffixes don't stack
+        base_user_prompt = user_prompt
 
-        # Generation with retry logic
+        # Generation with retry logic. Backoff only applies to transport-level
+        # failures; a failed quality check is a model-output issue against a
+        # local server, so sleeping before that retry is pure dead time.
         attempt = 0
+        quality_failures = 0
         backoff = 1.0
-        
+
         while attempt < self.config.retries:
             attempt += 1
             logger.info(f"Generation attempt {attempt}/{self.config.retries}")
@@ -264,32 +350,41 @@ OUTPUT ONLY THE FINAL LETTER. No commentary, no thinking process."""
                     model=self.model,
                     prompt=user_prompt,
                     system_prompt=system_prompt,
-                    temperature=self.temperature
+                    temperature=self.temperature,
+                    options=self._letter_options(system_prompt, user_prompt)
                 )
 
                 if response and isinstance(response, str):
-                    response = response.strip()
                     # Aggressively strip any residual CoT tokens (defense in depth)
-                    response = re.sub(r"</?think>", "", response, flags=re.IGNORECASE)
-                    response = re.sub(r"</?reason>", "", response, flags=re.IGNORECASE)
-                    response = re.sub(r"\[thinking\]|\[thought\]", "", response, flags=re.IGNORECASE)
-                    response = response.strip()
-                    
+                    # — one fused scan instead of three separate re.sub passes
+                    response = _STRIP_THINK.sub("", response).strip()
+
                     # Quality check
                     if self._check_quality(response, job_title, company):
                         logger.info("✓ Cover letter generated successfully")
                         return response
-                    else:
-                        logger.warning("Quality check failed, retrying...")
-                        # Reduce temperature for more deterministic output
-                        self.temperature = max(0.3, self.temperature - 0.1)
+
+                    quality_failures += 1
+                    if quality_failures >= self.config.max_quality_retries:
+                        logger.warning("Quality check failed repeatedly, giving up on retries")
+                        break
+                    logger.warning("Quality check failed, retrying immediately at lower temperature")
+                    # Reduce temperature for more deterministic output, and
+                    # steer the retry at the checks it must pass instead of
+                    # resending a byte-identical prompt
+                    self.temperature = max(0.3, self.temperature - 0.1)
+                    user_prompt = base_user_prompt + (
+                        f"\n\nIMPORTANT: mention '{company}' and the '{job_title}' role explicitly, "
+                        "and output ONLY the final letter with no reasoning or thinking tags."
+                    )
+                    continue
                 else:
                     logger.warning("Empty response from model")
 
             except Exception as e:
                 logger.exception(f"Error during generation: {e}")
 
-            # Backoff before retry
+            # Backoff before retrying a transport-level failure
             time.sleep(backoff)
             backoff *= self.config.retry_backoff
 
@@ -297,6 +392,101 @@ OUTPUT ONLY THE FINAL LETTER. No commentary, no thinking process."""
         logger.error("Failed to generate cover letter after all attempts")
         return self._generate_fallback_letter(job_title, company, candidate_info)
 
+    def generate_cover_letter_stream(
+        self,
+        cv_text: str,
+        job_data: Dict,
+        company_name: str = None,
+        candidate_info: Dict[str, str] = None
+    ):
+        """
+        Generate a cover letter and stream it token-by-token.
+
+        Same prompts as generate_cover_letter, but yields chunks as they are
+        generated so the UI shows progressive output (perceived latency drops
+        to time-to-first-token). Chain-of-thought spans are filtered out
+        online instead of via post-hoc regex stripping; the retry/quality loop
+        is not applied on the streaming path.
+
+        Yields:
+            Cover letter text chunks
+        """
+        if not cv_text or not job_data:
+            raise ValueError("cv_text and job_data are required")
+
+        job_title = job_data.get('title', 'the position').strip()
+        company = (company_name or job_data.get('company', 'your company')).strip()
+        job_description = job_data.get('description', '').strip()
+
+        if not candidate_info:
+            candidate_info = self._extract_candidate_info(cv_text)
+        system_prompt = self._build_system_prompt()
+        user_prompt = self._build_user_prompt(
+            job_title, company, job_description, cv_text, candidate_info
+        )
+
+        yield from filter_cot_stream(self.ollama_client.stream_generate(
+            model=self.model,
+            prompt=user_prompt,
+            temperature=self.temperature,
+            system_prompt=system_prompt,
+            options=self._letter_options(system_prompt, user_prompt)
+        ))
+
+    async def generate_cover_letter_async(
+        self,
+        cv_text: str,
+        job_data: Dict,
+        company_name: str = None,
+        client=None,
+        candidate_info: Dict[str, str] = None
+    ) -> str:
+        """
+        Async version of generate_cover_letter, for running concurrently with
+        CV tailoring via asyncio.gather.
+
+        A thin single-shot wrapper: CoT tokens are stripped but the retry /
+        quality loop is not applied; on an empty response the fallback letter
+        is returned.
+
+        Args:
+            cv_text: Full CV text
+            job_data: Dict with 'title', 'company', 'description'
+            company_name: Optional company override
+            client: Optional shared httpx.AsyncClient
+
+        Returns:
+            Professional cover letter text
+        """
+        if not cv_text or not job_data:
+            raise ValueError("cv_text and job_data are required")
+
+        job_title = job_data.get('title', 'the position').strip()
+        company = (company_name or job_data.get('company', 'your company')).strip()
+        job_description = job_data.get('description', '').strip()
+
+        if not candidate_info:
+            candidate_info = self._extract_candidate_info(cv_text)
+        system_prompt = self._build_system_prompt()
+        user_prompt = self._build_user_prompt(
+            job_title, company, job_description, cv_text, candidate_info
+        )
+
+        response = await self.ollama_client.agenerate(
+            model=self.model,
+            prompt=user_prompt,
+            system_prompt=system_prompt,
+            temperature=self.temperature,
+            client=client,
+            options=self._letter_options(system_prompt, user_prompt)
+        )
+
+        if response and isinstance(response, str):
+            return _STRIP_THINK.sub("", response).strip()
+
+        logger.error("Async generation returned no response, using fallback")
+        return self._generate_fallback_letter(job_title, company, candidate_info)
+
     def _generate_fallback_letter(
         self, 
         job_title: str, 
@@ -322,21 +512,11 @@ I would welcome the opportunity to discuss how my qualifications match your need
 Sincerely,
 {name}"""
 
-    def generate_short_pitch(self, cv_text: str, job_data: Dict, max_words: int = 30) -> str:
-        """
-        Generate a concise elevator pitch (for email subject lines).
-
-        Args:
-            cv_text: CV text
-            job_data: Job information dict
-            max_words: Maximum words in pitch
-
-        Returns:
-            One-sentence pitch
-        """
+    def _build_pitch_prompts(self, cv_text: str, job_data: Dict, max_words: int) -> tuple:
+        """Build (system_prompt, user_prompt) for the short pitch"""
         candidate_info = self._extract_candidate_info(cv_text)
         job_title = job_data.get('title', 'the position')
-        
+
         system_prompt = """You are an expert at writing compelling, concise professional pitches.
 Output ONLY a single sentence. NO reasoning, NO thinking process, NO extra commentary."""
 
@@ -348,24 +528,80 @@ ACHIEVEMENT: {candidate_info.get('achievements', '')[:200]}
 
 Write only the final pitch sentence:"""
 
+        return system_prompt, user_prompt
+
+    def _trim_pitch(self, response: str, max_words: int) -> str:
+        """Reduce a raw pitch response to one bounded sentence"""
+        sentence = response.strip().split('.')[0] + '.'
+        words = sentence.split()
+        if len(words) > max_words:
+            sentence = ' '.join(words[:max_words]) + '...'
+        return sentence
+
+    def generate_short_pitch(self, cv_text: str, job_data: Dict, max_words: int = 30) -> str:
+        """
+        Generate a concise elevator pitch (for email subject lines).
+
+        Args:
+            cv_text: CV text
+            job_data: Job information dict
+            max_words: Maximum words in pitch
+
+        Returns:
+            One-sentence pitch
+        """
+        system_prompt, user_prompt = self._build_pitch_prompts(cv_text, job_data, max_words)
+
         try:
             response = self.ollama_client.generate(
                 model=self.model,
                 prompt=user_prompt,
                 system_prompt=system_prompt,
-                temperature=0.3
+                temperature=0.3,
+                options=build_options(len(system_prompt) + len(user_prompt), num_predict=80)
             )
-            
+
             if response:
                 # Extract first sentence only
-                sentence = response.strip().split('.')[0] + '.'
-                words = sentence.split()
-                if len(words) > max_words:
-                    sentence = ' '.join(words[:max_words]) + '...'
-                return sentence
+                return self._trim_pitch(response, max_words)
         except Exception as e:
             logger.exception(f"Pitch generation failed: {e}")
 
+        candidate_info = self._extract_candidate_info(cv_text)
+        job_title = job_data.get('title', 'the position')
+        return f"Experienced {candidate_info.get('headline', 'professional')} seeking {job_title} role."
+
+    async def generate_short_pitch_async(self, cv_text: str, job_data: Dict,
+                                         max_words: int = 30, client=None) -> str:
+        """
+        Async version of generate_short_pitch, for batching alongside the CV
+        and cover letter generations via asyncio.gather.
+
+        Args:
+            cv_text: CV text
+            job_data: Job information dict
+            max_words: Maximum words in pitch
+            client: Optional shared httpx.AsyncClient
+
+        Returns:
+            One-sentence pitch
+        """
+        system_prompt, user_prompt = self._build_pitch_prompts(cv_text, job_data, max_words)
+
+        response = await self.ollama_client.agenerate(
+            model=self.model,
+            prompt=user_prompt,
+            system_prompt=system_prompt,
+            temperature=0.3,
+            client=client,
+            options=build_options(len(system_prompt) + len(user_prompt), num_predict=80)
+        )
+
+        if response:
+            return self._trim_pitch(response, max_words)
+
+        candidate_info = self._extract_candidate_info(cv_text)
+        job_title = job_data.get('title', 'the position')
         return f"Experienced {candidate_info.get('headline', 'professional')} seeking {job_title} role."
 
 
@@ -3,33 +3,27 @@ CV Processor Module
 Handles CV parsing and tailoring based on job requirements
 """
 
-from typing import Dict
-from .ollama_client import OllamaClient
+from typing import Dict, Iterator, Optional, Tuple
+from .ollama_client import OllamaClient, build_options, filter_cot_stream, _loads
 
 
 class CVProcessor:
     """Processes and tailors CV to match job requirements"""
 
-    def __init__(self, model: str = "llama3", temperature: float = 0.7):
+    def __init__(self, model: str = "llama3", temperature: float = 0.7,
+                 ollama_client: OllamaClient = None):
         self.model = model
         self.temperature = temperature
-        self.ollama_client = OllamaClient()
+        # Accept a shared client so the app reuses one connection pool
+        # across the sidebar health check and all processors
+        self.ollama_client = ollama_client or OllamaClient()
 
-    def tailor_cv(self, cv_text: str, job_data: Dict) -> str:
-        """
-        Tailor CV to match job requirements
-
-        Args:
-            cv_text: Original CV text
-            job_data: Dictionary containing job information
-
-        Returns:
-            Tailored CV text
-        """
+    def _build_prompts(self, cv_text: str, job_data: Dict) -> tuple:
+        """Build (system_prompt, user_prompt) for CV tailoring"""
         job_description = job_data.get('description', '')
         job_title = job_data.get('title', 'the position')
 
-        system_prompt = """You are an expert CV/resume writer and career coach. 
+        system_prompt = """You are an expert CV/resume writer and career coach.
 Your task is to tailor a CV to match a specific job posting.
 
 IMPORTANT RULES:
@@ -62,34 +56,218 @@ Please provide a tailored version that:
 
 Return ONLY the tailored CV text, no explanations."""
 
+        return system_prompt, user_prompt
+
+    def tailor_cv(self, cv_text: str, job_data: Dict) -> str:
+        """
+        Tailor CV to match job requirements
+
+        Args:
+            cv_text: Original CV text
+            job_data: Dictionary containing job information
+
+        Returns:
+            Tailored CV text
+        """
+        system_prompt, user_prompt = self._build_prompts(cv_text, job_data)
+
         tailored_cv = self.ollama_client.generate(
             model=self.model,
             prompt=user_prompt,
             temperature=self.temperature,
-            system_prompt=system_prompt
+            system_prompt=system_prompt,
+            options=build_options(len(system_prompt) + len(user_prompt), num_predict=1500)
         )
 
         return tailored_cv if tailored_cv else cv_text
 
-    def extract_key_skills(self, cv_text: str) -> list:
-        """Extract key skills from CV"""
-        prompt = f"""Extract the key technical and soft skills from this CV.
-Return them as a comma-separated list.
+    def tailor_cv_stream(self, cv_text: str, job_data: Dict) -> Iterator[str]:
+        """
+        Tailor CV and stream the result token-by-token
+
+        Same prompts as tailor_cv, but yields text chunks as they are generated
+        so the UI can render progressively. Chain-of-thought spans are filtered
+        out on the fly.
+
+        Args:
+            cv_text: Original CV text
+            job_data: Dictionary containing job information
+
+        Yields:
+            Tailored CV text chunks
+        """
+        system_prompt, user_prompt = self._build_prompts(cv_text, job_data)
+
+        yield from filter_cot_stream(self.ollama_client.stream_generate(
+            model=self.model,
+            prompt=user_prompt,
+            temperature=self.temperature,
+            system_prompt=system_prompt,
+            options=build_options(len(system_prompt) + len(user_prompt), num_predict=1500)
+        ))
+
+    def tailor_both(self, cv_text: str, job_data: Dict,
+                    company_name: str = None) -> Optional[Tuple[str, str]]:
+        """
+        Produce the tailored CV and the cover letter in one LLM call.
+
+        Two separate calls each prefill the same CV + job description; asking
+        for both in a single JSON-mode response pays that prefill cost once.
+
+        Args:
+            cv_text: Original CV text
+            job_data: Dictionary containing job information
+            company_name: Optional company override for the cover letter
+
+        Returns:
+            (tailored_cv, cover_letter) tuple, or None if the model returned
+            malformed output (caller should fall back to the two-call path)
+        """
+        job_description = job_data.get('description', '')
+        job_title = job_data.get('title', 'the position')
+        company = company_name or job_data.get('company', 'the company')
+
+        system_prompt = """You are an expert CV/resume writer and career coach.
+You produce BOTH a tailored CV and a professional cover letter in one response.
+
+IMPORTANT RULES:
+1. ONLY edit and rephrase existing content - DO NOT add fake experience or skills
+2. Emphasize relevant skills and experience that match the job requirements
+3. The cover letter must be 300-450 words, professional business letter format
+4. DO NOT fabricate or exaggerate - only reframe existing content
+5. Respond with a single JSON object and nothing else:
+   {"tailored_cv": "<full tailored CV text>", "cover_letter": "<full cover letter text>"}"""
+
+        user_prompt = f"""Tailor this CV and write a cover letter for the following job:
+
+JOB TITLE: {job_title}
+COMPANY: {company}
+
+JOB DESCRIPTION:
+{job_description[:1500]}
+
+ORIGINAL CV:
+{cv_text}
+
+Return ONLY the JSON object with keys "tailored_cv" and "cover_letter"."""
+
+        response = self.ollama_client.generate(
+            model=self.model,
+            prompt=user_prompt,
+            temperature=self.temperature,
+            system_prompt=system_prompt,
+            format="json",
+            options=build_options(len(system_prompt) + len(user_prompt), num_predict=2200)
+        )
+
+        if not response:
+            return None
+
+        try:
+            data = _loads(response)
+        except (ValueError, TypeError):
+            return None
+
+        tailored_cv = data.get('tailored_cv') if isinstance(data, dict) else None
+        cover_letter = data.get('cover_letter') if isinstance(data, dict) else None
+
+        if isinstance(tailored_cv, str) and tailored_cv.strip() \
+                and isinstance(cover_letter, str) and cover_letter.strip():
+            return tailored_cv.strip(), cover_letter.strip()
+        return None
+
+    async def tailor_cv_async(self, cv_text: str, job_data: Dict, client=None) -> str:
+        """
+        Async version of tailor_cv, for running concurrently with other
+        generations via asyncio.gather
+
+        Args:
+            cv_text: Original CV text
+            job_data: Dictionary containing job information
+            client: Optional shared httpx.AsyncClient
+
+        Returns:
+            Tailored CV text
+        """
+        system_prompt, user_prompt = self._build_prompts(cv_text, job_data)
+
+        tailored_cv = await self.ollama_client.agenerate(
+            model=self.model,
+            prompt=user_prompt,
+            temperature=self.temperature,
+            system_prompt=system_prompt,
+            client=client,
+            options=build_options(len(system_prompt) + len(user_prompt), num_predict=1500)
+        )
+
+        return tailored_cv if tailored_cv else cv_text
+
+    def extract_structured(self, cv_text: str) -> Optional[Dict[str, str]]:
+        """
+        Extract candidate info (name, headline, skills, achievements) in one
+        JSON-mode LLM call.
+
+        Replaces the two overlapping jobs previously done by the key-skills
+        call and the regex heuristics in the cover letter generator. Callers
+        should fall back to the regex path when this returns None.
+
+        Args:
+            cv_text: Full CV text
+
+        Returns:
+            Dict with 'name', 'headline', 'skills', 'achievements' string
+            fields (same shape as the regex extraction), or None on failure
+        """
+        system_prompt = """You extract structured facts from CVs.
+Respond with a single JSON object and nothing else:
+{"name": "...", "headline": "...", "skills": ["..."], "achievements": ["..."]}
+Use ONLY information present in the CV. Use empty values for missing fields."""
+
+        prompt = f"""Extract the candidate's name, professional headline, key skills and
+quantifiable achievements from this CV.
 
 CV:
-{cv_text[:1000]}
+{cv_text[:4000]}
 
-Skills:"""
+Return ONLY the JSON object."""
 
         response = self.ollama_client.generate(
             model=self.model,
             prompt=prompt,
-            temperature=0.3
+            temperature=0.1,
+            system_prompt=system_prompt,
+            format="json",
+            options=build_options(len(system_prompt) + len(prompt), num_predict=400)
         )
 
-        if response:
-            skills = [s.strip() for s in response.split(',')]
-            return skills
+        if not response:
+            return None
+
+        try:
+            data = _loads(response)
+        except (ValueError, TypeError):
+            return None
+        if not isinstance(data, dict):
+            return None
+
+        def _as_text(value) -> str:
+            if isinstance(value, list):
+                return "; ".join(str(v).strip() for v in value if str(v).strip())
+            return value.strip() if isinstance(value, str) else ""
+
+        info = {
+            "name": _as_text(data.get('name')),
+            "headline": _as_text(data.get('headline')),
+            "skills": _as_text(data.get('skills'))[:400],
+            "achievements": _as_text(data.get('achievements'))[:500],
+        }
+        return info if any(info.values()) else None
+
+    def extract_key_skills(self, cv_text: str) -> list:
+        """Extract key skills from CV"""
+        info = self.extract_structured(cv_text)
+        if info and info.get('skills'):
+            return [s.strip() for s in info['skills'].split(';') if s.strip()]
         return []
 
 
@@ -3,92 +3,380 @@ Ollama Client Module
 Handles communication with local Ollama LLM server
 """
 
+import logging
+import re
+import time
+import httpx
 import requests
-from typing import List, Dict, Optional
+from requests.adapters import HTTPAdapter, Retry
+from typing import Iterable, Iterator, List, Dict, Optional
+
+# orjson (C-accelerated) cuts JSON encode/decode time ~3-5x on the multi-KB
+# prompt payloads and per-chunk streaming lines; stdlib json is the fallback
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    _loads = orjson.loads
+except ImportError:
+    import json
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+# Module logger, following the cover letter generator's setup
+logger = logging.getLogger('ollama_client')
+logger.setLevel(logging.INFO)
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    logger.addHandler(_handler)
+
+
+# Fast path for streamed NDJSON lines: pull the message content field straight
+# out of the raw bytes instead of materializing the whole dict per chunk. Only
+# used when the captured value has no escape sequences; anything else falls
+# back to a full decode.
+_CONTENT_RE = re.compile(rb'"content"\s*:\s*"((?:[^"\\]|\\.)*)"')
+# Same fast path for httpx async streaming, which yields str lines
+_CONTENT_RE_STR = re.compile(r'"content"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+# Keep-alive pool shared semantics for self-created async clients
+_HTTPX_LIMITS = httpx.Limits(max_keepalive_connections=8)
+
+# Chain-of-thought span markers emitted by some models (Qwen, DeepSeek, etc.)
+_COT_OPEN = re.compile(r"<(?:think|reason)>", re.IGNORECASE)
+_COT_CLOSE = re.compile(r"</(?:think|reason)>", re.IGNORECASE)
+# Longest marker is "</reason>" (9 chars); used to hold back partial tags at chunk edges
+_MAX_TAG_LEN = 9
+
+
+def filter_cot_stream(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Filter <think>...</think> / <reason>...</reason> spans out of a token stream.
+
+    Text outside chain-of-thought spans is passed through as soon as it arrives,
+    so streaming output stays unbuffered; only text inside a span (and a short
+    tail that might be the start of a tag split across chunks) is held back.
+
+    Args:
+        chunks: Iterable of text chunks from a streaming generation
+
+    Yields:
+        Cleaned text chunks with chain-of-thought spans removed
+    """
+    inside = False
+    pending = ""
+
+    for chunk in chunks:
+        if not chunk:
+            continue
+        pending += chunk
+
+        while pending:
+            if inside:
+                match = _COT_CLOSE.search(pending)
+                if not match:
+                    # Discard thought text, but keep a tail that could be a partial closing tag
+                    tail = pending[-_MAX_TAG_LEN:]
+                    pending = tail if "<" in tail else ""
+                    break
+                pending = pending[match.end():]
+                inside = False
+            else:
+                match = _COT_OPEN.search(pending)
+                if not match:
+                    # Emit everything except a possible partial tag at the end
+                    cut = pending.rfind("<", max(0, len(pending) - _MAX_TAG_LEN))
+                    if cut == -1:
+                        safe, pending = pending, ""
+                    else:
+                        safe, pending = pending[:cut], pending[cut:]
+                    if safe:
+                        yield safe
+                    break
+                if match.start():
+                    yield pending[:match.start()]
+                pending = pending[match.end():]
+                inside = True
+
+    if pending and not inside:
+        yield pending
+
+
+def build_options(prompt_chars: int, num_predict: int) -> Dict:
+    """
+    Bounded generation options for a request.
+
+    Decode cost is O(tokens generated), so num_predict caps how far the model
+    can ramble past the length we asked for; num_ctx is sized to the prompt
+    (~3 chars/token estimate) plus the response budget instead of whatever
+    larger default the model ships with, since KV memory and prefill cost
+    grow linearly with context size.
+
+    Args:
+        prompt_chars: Combined length of system + user prompt in characters
+        num_predict: Maximum tokens to generate
+
+    Returns:
+        Options dict to pass to generate/agenerate/stream_generate
+    """
+    est_prompt_tokens = prompt_chars // 3
+    return {
+        "num_predict": num_predict,
+        "num_ctx": max(4096, est_prompt_tokens + num_predict + 200),
+    }
 
 
 class OllamaClient:
     """Client for interacting with local Ollama LLM"""
 
+    # Keep the model (and its KV cache for the constant system prompt) pinned
+    # in memory between calls, so repeat generations skip model load and
+    # system-prompt prefill
+    keep_alive = "30m"
+
     def __init__(self, base_url: str = "http://localhost:11434"):
         self.base_url = base_url
         self.api_url = f"{base_url}/api"
+        self.chat_url = f"{self.api_url}/chat"
+        # Payload templates keyed by (model, system_prompt, stream); only the
+        # user message, options and format change between calls
+        self._payload_templates = {}
+        # Pooled session with keep-alive: every call reuses one TCP connection
+        # instead of paying a fresh handshake per request. Retries only cover
+        # idempotent GETs (connection checks, model listing) by default.
+        self.session = requests.Session()
+        # Negotiate compressed responses explicitly; long JSON outputs
+        # compress 5-10x, which matters when Ollama runs on a remote host.
+        # requests decompresses transparently on read.
+        self.session.headers.update({"Accept-Encoding": "gzip, deflate"})
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # Short-lived TTL caches: the UI calls these on every rerun but the
+        # server state they probe changes rarely
+        self._connection_cache = None  # (monotonic ts, bool)
+        self._models_cache = None      # (monotonic ts, list)
+
+    def close(self):
+        """Release the pooled connections"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Seconds a cached health check / model list stays valid
+    CONNECTION_TTL = 5
+    MODELS_TTL = 30
 
     def check_connection(self) -> bool:
-        """Check if Ollama server is running"""
+        """Check if Ollama server is running (cached for a few seconds)"""
+        now = time.monotonic()
+        if self._connection_cache and now - self._connection_cache[0] < self.CONNECTION_TTL:
+            return self._connection_cache[1]
         try:
-            response = requests.get(self.base_url, timeout=2)
-            return response.status_code == 200
+            response = self.session.get(self.base_url, timeout=2)
+            ok = response.status_code == 200
         except:
-            return False
+            ok = False
+        self._connection_cache = (now, ok)
+        return ok
 
     def list_models(self) -> List[str]:
-        """List available models in Ollama"""
+        """List available models in Ollama (cached for a short interval)"""
+        now = time.monotonic()
+        if self._models_cache and now - self._models_cache[0] < self.MODELS_TTL:
+            return self._models_cache[1]
         try:
-            response = requests.get(f"{self.api_url}/tags", timeout=5)
+            response = self.session.get(f"{self.api_url}/tags", timeout=5)
             if response.status_code == 200:
-                data = response.json()
-                return [model['name'] for model in data.get('models', [])]
-            return []
+                data = _loads(response.content)
+                models = [model['name'] for model in data.get('models', [])]
+            else:
+                models = []
         except:
-            return []
+            models = []
+        self._models_cache = (now, models)
+        return models
 
-    def generate(self, model: str, prompt: str, temperature: float = 0.7, 
-                 system_prompt: str = None) -> Optional[str]:
+    def _chat_payload(self, model: str, prompt: str, temperature: float,
+                      stream: bool, system_prompt: str = None,
+                      options: Dict = None, format: str = None) -> Dict:
         """
-        Generate text using Ollama
-
-        Args:
-            model: Model name (e.g., 'llama3', 'mistral')
-            prompt: User prompt
-            temperature: Creativity level (0.0-1.0)
-            system_prompt: Optional system prompt for context
-
-        Returns:
-            Generated text or None on error
+        Build a chat payload from a cached per-(model, system_prompt, stream)
+        template. The template holds only the invariant fields (model, system
+        message, stream flag, keep_alive); each call gets its own top-level
+        dict with a fresh user message and options, since the client is
+        shared across session threads and the event loop and concurrent
+        callers must never mutate common state.
         """
-        try:
+        key = (model, system_prompt, stream)
+        template = self._payload_templates.get(key)
+        if template is None:
             messages = []
-
             if system_prompt:
                 messages.append({
                     "role": "system",
                     "content": system_prompt
                 })
-
             messages.append({
                 "role": "user",
-                "content": prompt
+                "content": ""
             })
-
-            payload = {
+            template = {
                 "model": model,
                 "messages": messages,
-                "stream": False,
-                "options": {
-                    "temperature": temperature
-                }
+                "stream": stream,
+                "keep_alive": self.keep_alive,
             }
+            self._payload_templates[key] = template
+
+        payload = {
+            **template,
+            "messages": template["messages"][:-1]
+            + [{"role": "user", "content": prompt}],
+            "options": {"temperature": temperature, **(options or {})},
+        }
+        if format:
+            payload["format"] = format
+        return payload
+
+    def warm_up(self, model: str, system_prompt: str = None) -> bool:
+        """
+        Fire a 1-token generation to load the model and pre-populate the
+        prompt-prefix (KV) cache for the constant system prompt, so the first
+        real generation skips model load and system-prompt prefill.
+
+        Args:
+            model: Model name to warm
+            system_prompt: Optional system prompt to pre-cache
+
+        Returns:
+            True if the warm-up request succeeded
+        """
+        payload = self._chat_payload(model, "Hi", 0.0, stream=False,
+                                     system_prompt=system_prompt,
+                                     options={"num_predict": 1})
+
+        try:
+            response = self.session.post(
+                self.chat_url,
+                data=_dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=60
+            )
+            return response.status_code == 200
+        except Exception as e:
+            logger.warning("Warm-up error: %s", e)
+            return False
+
+    def generate(self, model: str, prompt: str, temperature: float = 0.7,
+                 system_prompt: str = None, format: str = None,
+                 options: Dict = None) -> Optional[str]:
+        """
+        Generate text using Ollama
+
+        Args:
+            model: Model name (e.g., 'llama3', 'mistral')
+            prompt: User prompt
+            temperature: Creativity level (0.0-1.0)
+            system_prompt: Optional system prompt for context
+            format: Optional output format constraint (e.g., 'json' for
+                    Ollama's native JSON mode)
+            options: Optional extra generation options (num_predict, num_ctx,
+                     stop, ...) merged over the defaults
 
-            response = requests.post(
-                f"{self.api_url}/chat",
-                json=payload,
+        Returns:
+            Generated text or None on error
+        """
+        try:
+            payload = self._chat_payload(model, prompt, temperature,
+                                         stream=False,
+                                         system_prompt=system_prompt,
+                                         options=options, format=format)
+
+            response = self.session.post(
+                self.chat_url,
+                data=_dumps(payload),
+                headers=_JSON_HEADERS,
                 timeout=120
             )
 
             if response.status_code == 200:
-                data = response.json()
+                data = _loads(response.content)
+                return data.get('message', {}).get('content', '')
+            else:
+                logger.warning("Error: %s - %s", response.status_code, response.text)
+                return None
+
+        except Exception as e:
+            logger.warning("Generation error: %s", e)
+            return None
+
+    async def agenerate(self, model: str, prompt: str, temperature: float = 0.7,
+                        system_prompt: str = None,
+                        client: Optional[httpx.AsyncClient] = None,
+                        options: Dict = None) -> Optional[str]:
+        """
+        Async version of generate, for firing multiple requests concurrently
+        (Ollama >=0.2 batches concurrent requests via OLLAMA_NUM_PARALLEL).
+
+        Args:
+            model: Model name
+            prompt: User prompt
+            temperature: Creativity level (0.0-1.0)
+            system_prompt: Optional system prompt for context
+            client: Optional shared httpx.AsyncClient so concurrent requests
+                    reuse one connection pool; a temporary client is created
+                    if not provided
+
+        Returns:
+            Generated text or None on error
+        """
+        payload = self._chat_payload(model, prompt, temperature, stream=False,
+                                     system_prompt=system_prompt,
+                                     options=options)
+        body = _dumps(payload)
+
+        try:
+            if client is None:
+                async with httpx.AsyncClient(timeout=120, limits=_HTTPX_LIMITS) as own_client:
+                    response = await own_client.post(self.chat_url,
+                                                     content=body,
+                                                     headers=_JSON_HEADERS)
+            else:
+                response = await client.post(self.chat_url,
+                                             content=body,
+                                             headers=_JSON_HEADERS)
+
+            if response.status_code == 200:
+                data = _loads(response.content)
                 return data.get('message', {}).get('content', '')
             else:
-                print(f"Error: {response.status_code} - {response.text}")
+                logger.warning("Error: %s - %s", response.status_code, response.text)
                 return None
 
         except Exception as e:
-            print(f"Generation error: {e}")
+            logger.warning("Generation error: %s", e)
             return None
 
     def stream_generate(self, model: str, prompt: str, temperature: float = 0.7,
-                       system_prompt: str = None):
+                       system_prompt: str = None, options: Dict = None):
         """
         Stream text generation (for real-time output)
 
@@ -102,47 +390,89 @@ class OllamaClient:
             Text chunks as they are generated
         """
         try:
-            messages = []
+            payload = self._chat_payload(model, prompt, temperature,
+                                         stream=True,
+                                         system_prompt=system_prompt,
+                                         options=options)
 
-            if system_prompt:
-                messages.append({
-                    "role": "system",
-                    "content": system_prompt
-                })
-
-            messages.append({
-                "role": "user",
-                "content": prompt
-            })
-
-            payload = {
-                "model": model,
-                "messages": messages,
-                "stream": True,
-                "options": {
-                    "temperature": temperature
-                }
-            }
-
-            response = requests.post(
-                f"{self.api_url}/chat",
-                json=payload,
+            response = self.session.post(
+                self.chat_url,
+                data=_dumps(payload),
+                headers=_JSON_HEADERS,
                 stream=True,
                 timeout=120
             )
 
             if response.status_code == 200:
+                # Make sure NDJSON lines come off the wire decompressed even
+                # when reading through the raw stream
+                response.raw.decode_content = True
                 for line in response.iter_lines():
                     if line:
-                        import json
-                        data = json.loads(line)
+                        match = _CONTENT_RE.search(line)
+                        if match and b'\\' not in match.group(1):
+                            yield match.group(1).decode('utf-8')
+                            continue
+                        data = _loads(line)
                         if 'message' in data:
                             yield data['message'].get('content', '')
 
         except Exception as e:
-            print(f"Streaming error: {e}")
+            logger.warning("Streaming error: %s", e)
             yield None
 
+    async def astream_generate(self, model: str, prompt: str, temperature: float = 0.7,
+                               system_prompt: str = None,
+                               client: Optional[httpx.AsyncClient] = None,
+                               options: Dict = None):
+        """
+        Async version of stream_generate, so a streaming generation can run
+        concurrently with other async work instead of blocking the caller
+
+        Args:
+            model: Model name
+            prompt: User prompt
+            temperature: Creativity level
+            system_prompt: Optional system prompt
+            client: Optional shared httpx.AsyncClient
+            options: Optional extra generation options
+
+        Yields:
+            Text chunks as they are generated
+        """
+        payload = self._chat_payload(model, prompt, temperature, stream=True,
+                                     system_prompt=system_prompt,
+                                     options=options)
+
+        try:
+            if client is None:
+                async with httpx.AsyncClient(timeout=120, limits=_HTTPX_LIMITS) as own_client:
+                    async for chunk in self._astream_chat(own_client, payload):
+                        yield chunk
+            else:
+                async for chunk in self._astream_chat(client, payload):
+                    yield chunk
+        except Exception as e:
+            logger.warning("Streaming error: %s", e)
+            yield None
+
+    async def _astream_chat(self, client: httpx.AsyncClient, payload: Dict):
+        """Stream chat NDJSON over an async client, yielding content chunks"""
+        async with client.stream("POST", self.chat_url,
+                                 content=_dumps(payload),
+                                 headers=_JSON_HEADERS) as response:
+            if response.status_code != 200:
+                return
+            async for line in response.aiter_lines():
+                if line:
+                    match = _CONTENT_RE_STR.search(line)
+                    if match and '\\' not in match.group(1):
+                        yield match.group(1)
+                        continue
+                    data = _loads(line)
+                    if 'message' in data:
+                        yield data['message'].get('content', '')
+
 
 if __name__ == "__main__":
     # Test Ollama connection
@@ -3,14 +3,26 @@ Job Scraper Module
 Scrapes job postings from various job boards (LinkedIn, Indeed, StepStone)
 """
 
+import asyncio
+import functools
+import hashlib
+import logging
+import os
+import queue
 import re
+import tempfile
+import threading
 import time
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 from urllib.parse import urlparse
 
+import httpx
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter, Retry
+from bs4 import BeautifulSoup, SoupStrainer
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -19,13 +31,258 @@ from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 
 
+@functools.lru_cache(maxsize=1)
+def _chromedriver_path() -> str:
+    """Resolve the chromedriver binary once per process; the manager's
+    version check and download probe cost seconds per call otherwise"""
+    return ChromeDriverManager().install()
+
+
+
+# Module logger, following the cover letter generator's setup
+logger = logging.getLogger('job_scraper')
+logger.setLevel(logging.INFO)
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    logger.addHandler(_handler)
+
+# Connection limits for concurrent async fetches
+_ASYNC_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=16)
+
+# Per-site SoupStrainers: parse only the handful of elements each parser
+# actually reads instead of building a tree for the whole page. Matched
+# elements keep their full subtree, so get_text() on the description still
+# works. The generic/Selenium paths need the whole page and stay unstrained.
+def _bounded_text(soup: BeautifulSoup, limit: int = 2000) -> str:
+    """
+    Collect visible page text lazily, stopping once limit characters are
+    gathered. Equivalent to get_text(separator='\n', strip=True)[:limit]
+    without walking the rest of a multi-MB document first.
+    """
+    root = soup.body or soup
+    parts = []
+    total = 0
+    for text in root.stripped_strings:
+        parts.append(text)
+        total += len(text) + 1  # account for the joining newline
+        if total >= limit:
+            break
+    return "\n".join(parts)[:limit]
+
+
+class _TagFilter(SoupStrainer):
+    """SoupStrainer driven by a (name, attrs) predicate at parse time"""
+
+    def __init__(self, predicate):
+        super().__init__()
+        self._predicate = predicate
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self._predicate(name, attrs or {})
+
+
+def _class_str(attrs) -> str:
+    """Normalize a raw class attribute (string or token list) to a string"""
+    value = attrs.get('class') or ''
+    return ' '.join(value) if isinstance(value, (list, tuple)) else value
+
+
+_LINKEDIN_CLASSES = re.compile(
+    r'top-card-layout__title|topcard__|description__|show-more-less'
+)
+_LINKEDIN_STRAINER = _TagFilter(
+    lambda name, attrs: name == 'h1'
+    or bool(_LINKEDIN_CLASSES.search(_class_str(attrs)))
+)
+_INDEED_STRAINER = _TagFilter(
+    lambda name, attrs: name == 'h1'
+    or 'data-company-name' in attrs
+    or attrs.get('data-testid') == 'job-location'
+    or attrs.get('id') == 'jobDescriptionText'
+)
+_STEPSTONE_DATA_AT = {
+    'header-job-title', 'header-company-name',
+    'job-location', 'jobdescription-content',
+}
+_STEPSTONE_STRAINER = _TagFilter(
+    lambda name, attrs: attrs.get('data-at') in _STEPSTONE_DATA_AT
+)
+
+
 class JobScraper:
     """Scrapes job postings from various job sites"""
 
+    # CSS selectors as class constants, in priority order. soupsieve caches
+    # compiled selectors by string, so reusing the same constant means the
+    # selector is parsed once per process instead of once per call.
+    # Cap on concurrently pooled headless Chrome instances
+    SELENIUM_POOL_SIZE = 3
+
+    # How long cached page HTML stays valid on disk
+    CACHE_TTL = 3600  # seconds
+
+    # Site label -> parser method, matched against each dot-separated part
+    # of the hostname so every country TLD and subdomain of a board works
+    # (stepstone.at, indeed.co.uk, de.linkedin.com, ...); new boards only
+    # need an entry here
+    SITE_PARSERS = {
+        'linkedin': '_scrape_linkedin',
+        'indeed': '_scrape_indeed',
+        'stepstone': '_scrape_stepstone',
+    }
+
+    LINKEDIN_TITLE = ('h1.top-card-layout__title', 'h1')
+    LINKEDIN_COMPANY = ('a.topcard__org-name-link', 'span.topcard__flavor')
+    LINKEDIN_LOCATION = ('span.topcard__flavor--bullet',)
+    LINKEDIN_DESCRIPTION = ('div.description__text', 'div.show-more-less-html__markup')
+
+    INDEED_TITLE = ('h1.jobsearch-JobInfoHeader-title',)
+    INDEED_COMPANY = ('div[data-company-name]',)
+    INDEED_LOCATION = ('div[data-testid="job-location"]',)
+    INDEED_DESCRIPTION = ('div#jobDescriptionText',)
+
+    STEPSTONE_TITLE = ('h1[data-at="header-job-title"]',)
+    STEPSTONE_COMPANY = ('span[data-at="header-company-name"]',)
+    STEPSTONE_LOCATION = ('span[data-at="job-location"]',)
+    STEPSTONE_DESCRIPTION = ('div[data-at="jobdescription-content"]',)
+
+    @staticmethod
+    def _select_first(soup, selectors):
+        """Return the first element matching any selector, in priority order"""
+        for selector in selectors:
+            elem = soup.select_one(selector)
+            if elem is not None:
+                return elem
+        return None
+
     def __init__(self):
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
+        # One pooled session shared by all _scrape_* methods, so repeated
+        # scrapes against the same job board reuse the TCP/TLS connection
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # On-disk cache of raw page HTML, so re-scraping the same posting
+        # while the user iterates skips the network (and Chrome) entirely
+        self._cache_dir = os.path.join(tempfile.gettempdir(), 'tailor_cv_job_cache')
+        os.makedirs(self._cache_dir, exist_ok=True)
+        # Headless Chrome drivers are created lazily on first Selenium
+        # fallback (spawning a browser costs 2-5s) and pooled for reuse;
+        # the pool grows on demand up to SELENIUM_POOL_SIZE browsers
+        self._driver_pool = queue.Queue()
+        self._driver_count = 0
+        self._driver_lock = threading.Lock()
+
+    def _new_driver(self):
+        """Create one headless Chrome driver"""
+        chrome_options = Options()
+        chrome_options.add_argument('--headless')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument(f'user-agent={self.headers["User-Agent"]}')
+
+        service = Service(_chromedriver_path())
+        return webdriver.Chrome(service=service, options=chrome_options)
+
+    def _acquire_driver(self):
+        """Check a driver out of the pool, growing it up to the size cap"""
+        try:
+            return self._driver_pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._driver_lock:
+            if self._driver_count < self.SELENIUM_POOL_SIZE:
+                self._driver_count += 1
+                try:
+                    return self._new_driver()
+                except Exception:
+                    self._driver_count -= 1
+                    raise
+        # Pool is at capacity; wait for a checked-out driver to come back
+        return self._driver_pool.get()
+
+    def _release_driver(self, driver):
+        """Return a healthy driver to the pool"""
+        self._driver_pool.put(driver)
+
+    def _discard_driver(self, driver):
+        """Quit a broken driver and shrink the pool accounting"""
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._driver_lock:
+            self._driver_count -= 1
+
+    def close(self):
+        """Release the pooled connections and all pooled browsers"""
+        self.session.close()
+        while True:
+            try:
+                driver = self._driver_pool.get_nowait()
+            except queue.Empty:
+                break
+            self._discard_driver(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @classmethod
+    def _site_parser_name(cls, url: str) -> Optional[str]:
+        """Look up the parser method for a URL's hostname, if any"""
+        for label in urlparse(url).netloc.lower().split('.'):
+            parser_name = cls.SITE_PARSERS.get(label)
+            if parser_name:
+                return parser_name
+        return None
+
+    def _cache_path(self, url: str) -> str:
+        return os.path.join(self._cache_dir,
+                            hashlib.sha1(url.encode('utf-8')).hexdigest() + '.html')
+
+    def _cache_get(self, url: str) -> Optional[bytes]:
+        """Return cached HTML for a URL if present and fresh"""
+        path = self._cache_path(url)
+        try:
+            if time.time() - os.path.getmtime(path) < self.CACHE_TTL:
+                with open(path, 'rb') as f:
+                    return f.read()
+        except OSError:
+            pass
+        return None
+
+    def _cache_put(self, url: str, html: bytes) -> None:
+        """Store raw page HTML; cache failures never break a scrape"""
+        try:
+            with open(self._cache_path(url), 'wb') as f:
+                f.write(html)
+        except OSError:
+            pass
+
+    def _parse_job_page(self, url: str, html: bytes) -> Optional[Dict]:
+        """Dispatch pre-fetched HTML to the right site parser based on domain"""
+        parser_name = self._site_parser_name(url)
+        if parser_name:
+            return getattr(self, parser_name)(html, url)
+        # Generic scraper for unknown sites
+        return self._scrape_generic(html, url)
+
+    @classmethod
+    def _has_selenium_fallback(cls, url: str) -> bool:
+        """Known JS-heavy boards are worth retrying with a real browser"""
+        return cls._site_parser_name(url) is not None
 
     def scrape_job(self, url: str) -> Optional[Dict]:
         """
@@ -37,42 +294,96 @@ class JobScraper:
         Returns:
             Dictionary containing job information
         """
-        domain = urlparse(url).netloc
+        html = self._cache_get(url)
+        if html is not None:
+            return self._parse_job_page(url, html)
 
         try:
-            if 'linkedin.com' in domain:
-                return self._scrape_linkedin(url)
-            elif 'indeed.com' in domain or 'indeed.de' in domain:
-                return self._scrape_indeed(url)
-            elif 'stepstone' in domain:
-                return self._scrape_stepstone(url)
+            response = self.session.get(url, timeout=10)
+            # Never cache anti-bot/error pages, or they would be served for
+            # the full TTL instead of retrying on the next attempt
+            if response.ok:
+                self._cache_put(url, response.content)
+            return self._parse_job_page(url, response.content)
+        except Exception as e:
+            logger.warning("Error scraping job: %s", e)
+            if self._has_selenium_fallback(url):
+                return self._scrape_with_selenium(url)
+            return None
+
+    async def scrape_job_async(self, url: str,
+                               client: Optional[httpx.AsyncClient] = None) -> Optional[Dict]:
+        """
+        Async version of scrape_job, for fetching several postings concurrently
+
+        Args:
+            url: Job posting URL
+            client: Optional shared httpx.AsyncClient so concurrent fetches
+                    reuse one connection pool
+
+        Returns:
+            Dictionary containing job information
+        """
+        html = self._cache_get(url)
+        if html is not None:
+            return self._parse_job_page(url, html)
+
+        try:
+            if client is None:
+                async with httpx.AsyncClient(headers=self.headers, timeout=10,
+                                             follow_redirects=True,
+                                             limits=_ASYNC_LIMITS) as own_client:
+                    response = await own_client.get(url)
             else:
-                # Generic scraper for unknown sites
-                return self._scrape_generic(url)
+                response = await client.get(url)
+            html = response.content
+            if response.is_success:
+                self._cache_put(url, html)
         except Exception as e:
-            print(f"Error scraping job: {e}")
+            logger.warning("Error scraping job: %s", e)
+            if self._has_selenium_fallback(url):
+                return await asyncio.to_thread(self._scrape_with_selenium, url)
             return None
 
-    def _scrape_linkedin(self, url: str) -> Optional[Dict]:
-        """Scrape LinkedIn job posting"""
+        return self._parse_job_page(url, html)
+
+    async def scrape_many(self, urls: List[str]) -> List[Optional[Dict]]:
+        """
+        Scrape several job postings concurrently over one connection pool
+
+        Args:
+            urls: Job posting URLs
+
+        Returns:
+            List of job dictionaries (None entries for failed scrapes),
+            in the same order as the input URLs
+        """
+        async with httpx.AsyncClient(headers=self.headers, timeout=10,
+                                     follow_redirects=True,
+                                     limits=_ASYNC_LIMITS) as client:
+            return list(await asyncio.gather(
+                *[self.scrape_job_async(url, client) for url in urls]
+            ))
+
+    def _scrape_linkedin(self, html: bytes, url: str) -> Optional[Dict]:
+        """Parse a pre-fetched LinkedIn job posting page"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(html, 'lxml', parse_only=_LINKEDIN_STRAINER)
 
             # Extract job title
-            title_elem = soup.find('h1', class_='top-card-layout__title') or soup.find('h1')
+            title_elem = self._select_first(soup, self.LINKEDIN_TITLE)
             title = title_elem.text.strip() if title_elem else "Not found"
 
             # Extract company
-            company_elem = soup.find('a', class_='topcard__org-name-link') or soup.find('span', class_='topcard__flavor')
+            company_elem = self._select_first(soup, self.LINKEDIN_COMPANY)
             company = company_elem.text.strip() if company_elem else "Not found"
 
             # Extract location
-            location_elem = soup.find('span', class_='topcard__flavor--bullet')
+            location_elem = self._select_first(soup, self.LINKEDIN_LOCATION)
             location = location_elem.text.strip() if location_elem else "Not specified"
 
             # Extract job description
-            desc_elem = soup.find('div', class_='description__text') or soup.find('div', class_='show-more-less-html__markup')
+            desc_elem = self._select_first(soup, self.LINKEDIN_DESCRIPTION)
             description = desc_elem.get_text(separator='\n', strip=True) if desc_elem else ""
 
             return {
@@ -84,29 +395,28 @@ class JobScraper:
                 'source': 'LinkedIn'
             }
         except Exception as e:
-            print(f"LinkedIn scraping error: {e}")
+            logger.warning("LinkedIn scraping error: %s", e)
             return self._scrape_with_selenium(url)
 
-    def _scrape_indeed(self, url: str) -> Optional[Dict]:
-        """Scrape Indeed job posting"""
+    def _scrape_indeed(self, html: bytes, url: str) -> Optional[Dict]:
+        """Parse a pre-fetched Indeed job posting page"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(html, 'lxml', parse_only=_INDEED_STRAINER)
 
             # Extract title
-            title_elem = soup.find('h1', class_='jobsearch-JobInfoHeader-title')
+            title_elem = self._select_first(soup, self.INDEED_TITLE)
             title = title_elem.text.strip() if title_elem else "Not found"
 
             # Extract company
-            company_elem = soup.find('div', {'data-company-name': True})
+            company_elem = self._select_first(soup, self.INDEED_COMPANY)
             company = company_elem.text.strip() if company_elem else "Not found"
 
             # Extract location
-            location_elem = soup.find('div', {'data-testid': 'job-location'})
+            location_elem = self._select_first(soup, self.INDEED_LOCATION)
             location = location_elem.text.strip() if location_elem else "Not specified"
 
             # Extract description
-            desc_elem = soup.find('div', id='jobDescriptionText')
+            desc_elem = self._select_first(soup, self.INDEED_DESCRIPTION)
             description = desc_elem.get_text(separator='\n', strip=True) if desc_elem else ""
 
             return {
@@ -118,29 +428,28 @@ class JobScraper:
                 'source': 'Indeed'
             }
         except Exception as e:
-            print(f"Indeed scraping error: {e}")
+            logger.warning("Indeed scraping error: %s", e)
             return self._scrape_with_selenium(url)
 
-    def _scrape_stepstone(self, url: str) -> Optional[Dict]:
-        """Scrape StepStone job posting"""
+    def _scrape_stepstone(self, html: bytes, url: str) -> Optional[Dict]:
+        """Parse a pre-fetched StepStone job posting page"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(html, 'lxml', parse_only=_STEPSTONE_STRAINER)
 
             # Extract title
-            title_elem = soup.find('h1', {'data-at': 'header-job-title'})
+            title_elem = self._select_first(soup, self.STEPSTONE_TITLE)
             title = title_elem.text.strip() if title_elem else "Not found"
 
             # Extract company
-            company_elem = soup.find('span', {'data-at': 'header-company-name'})
+            company_elem = self._select_first(soup, self.STEPSTONE_COMPANY)
             company = company_elem.text.strip() if company_elem else "Not found"
 
             # Extract location
-            location_elem = soup.find('span', {'data-at': 'job-location'})
+            location_elem = self._select_first(soup, self.STEPSTONE_LOCATION)
             location = location_elem.text.strip() if location_elem else "Not specified"
 
             # Extract description
-            desc_elem = soup.find('div', {'data-at': 'jobdescription-content'})
+            desc_elem = self._select_first(soup, self.STEPSTONE_DESCRIPTION)
             description = desc_elem.get_text(separator='\n', strip=True) if desc_elem else ""
 
             return {
@@ -152,72 +461,90 @@ class JobScraper:
                 'source': 'StepStone'
             }
         except Exception as e:
-            print(f"StepStone scraping error: {e}")
+            logger.warning("StepStone scraping error: %s", e)
             return self._scrape_with_selenium(url)
 
-    def _scrape_generic(self, url: str) -> Optional[Dict]:
-        """Generic scraper for unknown job sites"""
+    def _scrape_generic(self, html: bytes, url: str) -> Optional[Dict]:
+        """Parse a pre-fetched page from an unknown job site"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(html, 'lxml')
 
             # Try to find title (h1 is common)
             title = soup.find('h1')
             title = title.text.strip() if title else "Job Title"
 
-            # Get all text content
-            body_text = soup.get_text(separator='\n', strip=True)
+            # Get text content, stopping at the description cap
+            body_text = _bounded_text(soup)
 
             return {
                 'title': title,
                 'company': "Not specified",
                 'location': "Not specified",
-                'description': body_text[:2000],  # Limit to 2000 chars
+                'description': body_text,
                 'url': url,
                 'source': 'Generic'
             }
         except Exception as e:
-            print(f"Generic scraping error: {e}")
+            logger.warning("Generic scraping error: %s", e)
             return None
 
+    def scrape_many_selenium(self, urls: List[str]) -> List[Optional[Dict]]:
+        """
+        Scrape several JavaScript-heavy postings concurrently, dispatching
+        across the browser pool
+
+        Args:
+            urls: Job posting URLs
+
+        Returns:
+            List of job dictionaries (None entries for failed scrapes),
+            in the same order as the input URLs
+        """
+        with ThreadPoolExecutor(max_workers=self.SELENIUM_POOL_SIZE) as executor:
+            return list(executor.map(self._scrape_with_selenium, urls))
+
     def _scrape_with_selenium(self, url: str) -> Optional[Dict]:
         """Fallback scraper using Selenium for JavaScript-heavy sites"""
+        driver = None
         try:
-            # Setup headless Chrome
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument(f'user-agent={self.headers["User-Agent"]}')
-
-            service = Service(ChromeDriverManager().install())
-            driver = webdriver.Chrome(service=service, options=chrome_options)
-
+            driver = self._acquire_driver()
             driver.get(url)
-            time.sleep(3)  # Wait for page to load
+            try:
+                # Wait until the page has actually rendered a heading rather
+                # than sleeping a fixed 3s; most pages settle well under 1s
+                WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.TAG_NAME, 'h1'))
+                )
+            except TimeoutException:
+                pass  # Fall through and parse whatever rendered
 
             # Get page content
             page_source = driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
+            soup = BeautifulSoup(page_source, 'lxml')
 
             # Extract basic info
             title = soup.find('h1')
             title = title.text.strip() if title else "Job Title"
 
-            body_text = soup.get_text(separator='\n', strip=True)
-
-            driver.quit()
+            body_text = _bounded_text(soup)
+            # Only cache pages that actually rendered content
+            if body_text:
+                self._cache_put(url, page_source.encode('utf-8'))
 
+            self._release_driver(driver)
             return {
                 'title': title,
                 'company': "Not specified",
                 'location': "Not specified",
-                'description': body_text[:2000],
+                'description': body_text,
                 'url': url,
                 'source': 'Selenium'
             }
         except Exception as e:
-            print(f"Selenium scraping error: {e}")
+            logger.warning("Selenium scraping error: %s", e)
+            # The session may be dead; discard it so the pool stays healthy
+            if driver is not None:
+                self._discard_driver(driver)
             return None
 
 
@@ -4,11 +4,39 @@ Handles file upload, text extraction, and document creation
 """
 
 import io
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from docx import Document
 import PyPDF2
 import pdfplumber
 
+# PyMuPDF's C core extracts text an order of magnitude faster than the
+# pure-Python pdfplumber stack; fall back gracefully if it is not installed
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+
+# Heading heuristics for create_docx, compiled once. A short paragraph with
+# no lowercase letters (and at least one capital) is a top-level heading; one
+# whose prefix before the first colon is all-caps is a subheading. These mirror
+# the previous isupper()/split(':') checks without allocating per paragraph.
+_HEAD1_RE = re.compile(r'^[^a-z]*[A-Z][^a-z]*$')
+_HEAD2_RE = re.compile(r'^[^a-z:]*[A-Z][^a-z:]*:')
+
+
+
+# Module logger, following the cover letter generator's setup
+logger = logging.getLogger('file_handler')
+logger.setLevel(logging.INFO)
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(asctime)s [%(levelname)s] %(message)s"))
+    logger.addHandler(_handler)
+
 
 class FileHandler:
     """Handles file operations for CV processing"""
@@ -16,17 +44,21 @@ class FileHandler:
     def __init__(self):
         pass
 
-    def extract_text_from_file(self, uploaded_file) -> Optional[str]:
+    def extract_text_from_file(self, uploaded_file, filename: str = None) -> Optional[str]:
         """
         Extract text from uploaded PDF or DOCX file
 
         Args:
-            uploaded_file: Streamlit uploaded file object
+            uploaded_file: Streamlit uploaded file object or any file-like
+            filename: Optional explicit filename, for file-likes (e.g. a
+                      BytesIO of cached upload bytes) without a name attribute
 
         Returns:
             Extracted text or None on error
         """
-        file_type = uploaded_file.name.split('.')[-1].lower()
+        if filename is None:
+            filename = uploaded_file.name
+        file_type = filename.split('.')[-1].lower()
 
         try:
             if file_type == 'pdf':
@@ -34,48 +66,82 @@ class FileHandler:
             elif file_type == 'docx':
                 return self._extract_from_docx(uploaded_file)
             else:
-                print(f"Unsupported file type: {file_type}")
+                logger.warning("Unsupported file type: %s", file_type)
                 return None
         except Exception as e:
-            print(f"Error extracting text: {e}")
+            logger.warning("Error extracting text: %s", e)
             return None
 
     def _extract_from_pdf(self, file) -> str:
-        """Extract text from PDF using pdfplumber (more reliable)"""
+        """Extract text from PDF using PyMuPDF, falling back to pdfplumber"""
+        # Read the upload once; every parser then gets its own fresh buffer,
+        # so a failed attempt never hands a half-consumed stream to the next
+        data = file.read()
+        if fitz is not None:
+            try:
+                with fitz.open(stream=data, filetype='pdf') as doc:
+                    n_pages = doc.page_count
+                    if n_pages <= 2:
+                        # Pool setup costs more than it saves on short docs
+                        return "\n".join(page.get_text() for page in doc).strip()
+                return self._extract_pdf_parallel(data, n_pages)
+            except Exception:
+                pass
+        return self._extract_from_pdf_plumber(data)
+
+    @staticmethod
+    def _extract_pdf_parallel(data: bytes, n_pages: int) -> str:
+        """
+        Extract pages concurrently. MuPDF releases the GIL inside get_text
+        but a document handle is not thread-safe, so each worker opens its
+        own handle over the same in-memory bytes and takes a page range.
+        """
+        workers = min(8, n_pages)
+
+        def extract_range(bounds) -> str:
+            start, stop = bounds
+            with fitz.open(stream=data, filetype='pdf') as doc:
+                return "\n".join(doc[i].get_text() for i in range(start, stop))
+
+        per_worker = -(-n_pages // workers)  # ceil division
+        ranges = [(i, min(i + per_worker, n_pages))
+                  for i in range(0, n_pages, per_worker)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return "\n".join(executor.map(extract_range, ranges)).strip()
+
+    def _extract_from_pdf_plumber(self, data: bytes) -> str:
+        """Fallback PDF extraction using pdfplumber (layout-aware but slow)"""
         try:
-            text = ""
-            with pdfplumber.open(file) as pdf:
+            # Accumulate in a list and join once; += on str re-copies the
+            # whole accumulated text for every page
+            parts = []
+            with pdfplumber.open(io.BytesIO(data)) as pdf:
                 for page in pdf.pages:
                     page_text = page.extract_text()
                     if page_text:
-                        text += page_text + "\n"
-            return text.strip()
+                        parts.append(page_text)
+            return "\n".join(parts).strip()
         except:
-            # Fallback to PyPDF2
-            return self._extract_from_pdf_pypdf2(file)
+            # Fallback to PyPDF2, on its own fresh buffer
+            return self._extract_from_pdf_pypdf2(io.BytesIO(data))
 
     def _extract_from_pdf_pypdf2(self, file) -> str:
         """Fallback PDF extraction using PyPDF2"""
         try:
             pdf_reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
+            parts = [page.extract_text() for page in pdf_reader.pages]
+            return "\n".join(parts).strip()
         except Exception as e:
-            print(f"PyPDF2 extraction error: {e}")
+            logger.warning("PyPDF2 extraction error: %s", e)
             return ""
 
     def _extract_from_docx(self, file) -> str:
         """Extract text from DOCX file"""
         try:
             doc = Document(file)
-            text = ""
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-            return text.strip()
+            return "\n".join(p.text for p in doc.paragraphs).strip()
         except Exception as e:
-            print(f"DOCX extraction error: {e}")
+            logger.warning("DOCX extraction error: %s", e)
             return ""
 
     def create_docx(self, text: str, title: str = "Document") -> bytes:
@@ -100,9 +166,9 @@ class FileHandler:
             for para in paragraphs:
                 if para.strip():
                     # Check if it's a heading (simple heuristic)
-                    if len(para) < 100 and para.isupper():
+                    if len(para) < 100 and _HEAD1_RE.match(para):
                         doc.add_heading(para, level=1)
-                    elif len(para) < 100 and ':' in para and para.split(':')[0].isupper():
+                    elif len(para) < 100 and _HEAD2_RE.match(para):
                         doc.add_heading(para, level=2)
                     else:
                         doc.add_paragraph(para)
@@ -114,7 +180,7 @@ class FileHandler:
 
             return docx_buffer.getvalue()
         except Exception as e:
-            print(f"Error creating DOCX: {e}")
+            logger.warning("Error creating DOCX: %s", e)
             return b""
 
     def create_txt(self, text: str) -> bytes: